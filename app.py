@@ -3,13 +3,25 @@ DigiGold Reconciliation Web Application
 Reconciles transactions across Finfinity, Cashfree, and Augmont systems.
 """
 
-from flask import Flask, request, render_template, send_file, jsonify
+from flask import Flask, request, render_template, send_file, jsonify, url_for
+from werkzeug.datastructures import FileStorage
 import pandas as pd
+import numpy as np
 from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
+import json
+import os
 import re
+import tempfile
+import time
+import traceback
+import uuid
 
 app = Flask(__name__)
 
+# Augmont statuses meaning "cancelled" (either spelling)
+CANCELLED_PATTERN = re.compile(r'cancell?ed')
+
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
@@ -22,91 +34,124 @@ def read_file(file_obj):
     filename = file_obj.filename.lower()
     
     if filename.endswith('.csv'):
-        return pd.read_csv(file_obj)
+        # The C parser leaves date-like values as text, so the RAW sheets keep them as uploaded
+        return pd.read_csv(file_obj, engine='c')
     elif filename.endswith('.xlsx') or filename.endswith('.xls'):
-        return pd.read_excel(file_obj, engine='openpyxl')
+        # calamine (Rust) streams cells instead of building openpyxl's in-memory workbook
+        return pd.read_excel(file_obj, engine='calamine')
     else:
         raise ValueError(f"Unsupported file format: {filename}. Please upload CSV or XLSX files.")
 
 
-def clean_key(value):
+def normalize_key(series):
     """
     Normalize keys for matching: strip whitespace, convert to lowercase, handle NaN.
     """
-    if pd.isna(value):
-        return ''
-    return str(value).strip().lower()
+    return series.astype('string').str.strip().str.lower().fillna('')
+
+
+def normalize_status(series):
+    """
+    Normalize a status column through its categories: strip whitespace, convert to lowercase, handle NaN.
+    Returns a categorical Series, so later comparisons work on the integer codes.
+    """
+    status = series.astype('category')
+    # Trailing '' is the target for code -1 (NaN)
+    normalized = normalize_key(pd.Series(status.cat.categories, dtype=object)).tolist() + ['']
+    remap, categories = pd.factorize(np.asarray(normalized, dtype=object))
+    codes = remap[status.cat.codes.to_numpy()]
+    return pd.Series(pd.Categorical.from_codes(codes, categories), index=series.index)
+
+
+def fill_missing_status(status, matched):
+    """
+    Mark the status of unmatched records as 'MISSING', keeping the categorical dtype.
+    """
+    if 'MISSING' not in status.cat.categories:
+        status = status.cat.add_categories('MISSING')
+    return status.where(matched, 'MISSING')
 
 
 def classify_by_decision_table(fin_status, cf_status, aug_status):
     """
-    Apply the master decision table to determine category, action, and priority.
+    Apply the master decision table to whole status columns at once.
     
-    Returns: (decision_category, action_required, priority)
+    Takes three aligned Series (Finfinity, Cashfree, Augmont statuses).
+    Returns: (decision_category, action_required, priority) as arrays
     """
     # Normalize statuses for comparison
-    fin = clean_key(fin_status)
-    cf = clean_key(cf_status)
-    aug = clean_key(aug_status)
+    fin = normalize_status(fin_status)
+    cf = normalize_status(cf_status)
+    aug = normalize_status(aug_status)
+    
+    # Only a few dozen distinct (fin, cf, aug) triples occur in practice:
+    # evaluate the table once per triple and broadcast the result back by triple id
+    combined_codes = (
+        fin.cat.codes.to_numpy(dtype=np.int64) * len(cf.cat.categories) + cf.cat.codes.to_numpy()
+    ) * len(aug.cat.categories) + aug.cat.codes.to_numpy()
+    triple_ids, _ = pd.factorize(combined_codes)
+    first_rows = np.unique(triple_ids, return_index=True)[1]
+    fin, cf, aug = (status.iloc[first_rows].reset_index(drop=True) for status in (fin, cf, aug))
     
     # Check for missing statuses
-    cf_missing = cf == '' or cf == 'missing'
-    aug_missing = aug == '' or aug == 'missing'
+    aug_missing = aug.eq('') | aug.eq('missing')
     
     # Determine if Augmont status indicates "cancelled"
-    aug_cancelled = 'cancelled' in aug or 'canceled' in aug
-    aug_not_cancelled = not aug_missing and not aug_cancelled
+    aug_cancelled = aug.str.contains(CANCELLED_PATTERN, na=False)
+    aug_not_cancelled = ~aug_missing & ~aug_cancelled
+    
+    fin_paid_or_active = fin.eq('paid') | fin.eq('active')
+    cf_failed = cf.eq('failed')
+    cf_pending = cf.eq('pending')
+    cf_success = cf.eq('success')
     
     # ========================================================================
     # MASTER DECISION TABLE (14 scenarios)
+    # Conditions are evaluated in order; the first match wins.
     # ========================================================================
-    
-    # Rule 5: Cashfree FAILED → PAYMENT_FAILED, IGNORE (Priority 1)
-    if cf == 'failed':
+    rules = [
         # Rule 8: Finfinity ACTIVE + Cashfree FAILED → ORDER_ACTIVE_PAYMENT_FAILED, CANCEL ORDER (Priority 3)
-        if fin == 'active':
-            return ('ORDER_ACTIVE_PAYMENT_FAILED', 'CANCEL ORDER', 3)
+        (cf_failed & fin.eq('active'), ('ORDER_ACTIVE_PAYMENT_FAILED', 'CANCEL ORDER', 3)),
         # Rule 9: Finfinity PAID + Cashfree FAILED → INCONSISTENT_STATE, INVESTIGATE (Priority 4)
-        if fin == 'paid':
-            return ('INCONSISTENT_STATE', 'INVESTIGATE', 4)
-        return ('PAYMENT_FAILED', 'IGNORE', 1)
-    
-    # Rule 6: Cashfree USER_DROPPED → USER_DROPPED, IGNORE (Priority 1)
-    if cf == 'user_dropped':
-        return ('USER_DROPPED', 'IGNORE', 1)
-    
-    # Rule 11: Cashfree PENDING → PAYMENT_NOT_CONFIRMED, WAIT / RETRY (Priority 2)
-    if cf == 'pending':
+        (cf_failed & fin.eq('paid'), ('INCONSISTENT_STATE', 'INVESTIGATE', 4)),
+        # Rule 5: Cashfree FAILED → PAYMENT_FAILED, IGNORE (Priority 1)
+        (cf_failed, ('PAYMENT_FAILED', 'IGNORE', 1)),
+        # Rule 6: Cashfree USER_DROPPED → USER_DROPPED, IGNORE (Priority 1)
+        (cf.eq('user_dropped'), ('USER_DROPPED', 'IGNORE', 1)),
         # Rule 7: Finfinity PENDING + Cashfree PENDING → PAYMENT_IN_PROGRESS, WAIT / RETRY (Priority 2)
-        if fin == 'pending':
-            return ('PAYMENT_IN_PROGRESS', 'WAIT / RETRY', 2)
-        return ('PAYMENT_NOT_CONFIRMED', 'WAIT / RETRY', 2)
-    
-    # Rule 12: Finfinity FAILED → INTERNAL_FAILURE, INVESTIGATE (Priority 3)
-    if fin == 'failed':
+        (cf_pending & fin.eq('pending'), ('PAYMENT_IN_PROGRESS', 'WAIT / RETRY', 2)),
+        # Rule 11: Cashfree PENDING → PAYMENT_NOT_CONFIRMED, WAIT / RETRY (Priority 2)
+        (cf_pending, ('PAYMENT_NOT_CONFIRMED', 'WAIT / RETRY', 2)),
         # Rule 4: Finfinity FAILED + Cashfree SUCCESS + Augmont "not cancelled"
-        if cf == 'success' and aug_not_cancelled:
-            return ('GATEWAY_SUCCESS_INTERNAL_FAIL', 'INVESTIGATE', 3)
-        return ('INTERNAL_FAILURE', 'INVESTIGATE', 3)
-    
-    # Rule 10: Cashfree SUCCESS + Augmont missing → PAYMENT_SUCCESS_ORDER_MISSING, INVESTIGATE / CREATE ORDER (Priority 4)
-    if cf == 'success' and aug_missing:
-        return ('PAYMENT_SUCCESS_ORDER_MISSING', 'INVESTIGATE / CREATE ORDER', 4)
+        (fin.eq('failed') & cf_success & aug_not_cancelled, ('GATEWAY_SUCCESS_INTERNAL_FAIL', 'INVESTIGATE', 3)),
+        # Rule 12: Finfinity FAILED → INTERNAL_FAILURE, INVESTIGATE (Priority 3)
+        (fin.eq('failed'), ('INTERNAL_FAILURE', 'INVESTIGATE', 3)),
+        # Rule 10: Cashfree SUCCESS + Augmont missing → PAYMENT_SUCCESS_ORDER_MISSING, INVESTIGATE / CREATE ORDER (Priority 4)
+        (cf_success & aug_missing, ('PAYMENT_SUCCESS_ORDER_MISSING', 'INVESTIGATE / CREATE ORDER', 4)),
+        # Rule 1: Finfinity PAID/ACTIVE + Cashfree SUCCESS + Augmont "not cancelled" → FULLY_RECONCILED (Priority 1)
+        (fin_paid_or_active & cf_success & aug_not_cancelled, ('FULLY_RECONCILED', 'NO ACTION', 1)),
+        # Rule 2: Finfinity PAID/ACTIVE + Cashfree SUCCESS + Augmont "cancelled" → REFUND_REQUIRED (Priority 4)
+        (fin_paid_or_active & cf_success & aug_cancelled, ('REFUND_REQUIRED', 'REFUND REQUIRED', 4)),
+        # Rule 3: Finfinity PENDING + Cashfree SUCCESS + Augmont "not cancelled" → SYNC_PENDING (Priority 2)
+        (fin.eq('pending') & cf_success & aug_not_cancelled, ('SYNC_PENDING', 'SYNC / MONITOR', 2)),
+    ]
+    conditions = [condition.to_numpy(dtype=bool) for condition, _ in rules]
     
-    # Rule 1: Finfinity PAID/ACTIVE + Cashfree SUCCESS + Augmont "not cancelled" → FULLY_RECONCILED (Priority 1)
-    if (fin == 'paid' or fin == 'active') and cf == 'success' and aug_not_cancelled:
-        return ('FULLY_RECONCILED', 'NO ACTION', 1)
+    # Rule 13: Default - Missing in Cashfree or Augmont → UNCATEGORIZED, INVESTIGATE (Priority 3)
+    outcomes = [outcome for _, outcome in rules] + [('UNCATEGORIZED', 'INVESTIGATE', 3)]
     
-    # Rule 2: Finfinity PAID/ACTIVE + Cashfree SUCCESS + Augmont "cancelled" → REFUND_REQUIRED (Priority 4)
-    if (fin == 'paid' or fin == 'active') and cf == 'success' and aug_cancelled:
-        return ('REFUND_REQUIRED', 'REFUND REQUIRED', 4)
+    # Resolve each record to a small rule id, then decode the outputs through the rule table
+    rule_ids = np.select(conditions, list(range(len(rules))), default=len(rules)).astype(np.int8)
+    rule_ids = rule_ids[triple_ids]
+    categories, actions, priorities = (np.asarray(column) for column in zip(*outcomes))
+    category_labels, category_codes = np.unique(categories, return_inverse=True)
+    action_labels, action_codes = np.unique(actions, return_inverse=True)
     
-    # Rule 3: Finfinity PENDING + Cashfree SUCCESS + Augmont "not cancelled" → SYNC_PENDING (Priority 2)
-    if fin == 'pending' and cf == 'success' and aug_not_cancelled:
-        return ('SYNC_PENDING', 'SYNC / MONITOR', 2)
+    decision_category = pd.Categorical.from_codes(category_codes[rule_ids], category_labels)
+    action_required = pd.Categorical.from_codes(action_codes[rule_ids], action_labels)
+    priority = priorities.astype(np.int8)[rule_ids]
     
-    # Rule 13: Default - Missing in Cashfree or Augmont → UNCATEGORIZED, INVESTIGATE (Priority 3)
-    return ('UNCATEGORIZED', 'INVESTIGATE', 3)
+    return decision_category, action_required, priority
 
 
 def validate_columns(df, required_columns, file_name):
@@ -141,11 +186,12 @@ def get_column_case_insensitive(df, column_name):
     return None
 
 
-def sanitize_sheet_name(name):
+def sanitize_sheet_name(name, used_names=None):
     """
     Sanitize sheet name to be Excel-compatible.
     - Max 31 characters
     - No special characters: [ ] : * ? / \
+    - Unique among used_names (lowercased names already in the workbook), if given
     """
     # Remove invalid characters
     invalid_chars = ['[', ']', ':', '*', '?', '/', '\\']
@@ -156,6 +202,14 @@ def sanitize_sheet_name(name):
     if len(name) > 31:
         name = name[:31]
     
+    # Excel compares sheet names case-insensitively; number any repeats
+    if used_names is not None:
+        base, suffix = name, 1
+        while name.lower() in used_names:
+            name = base[:31 - len(str(suffix))] + str(suffix)
+            suffix += 1
+        used_names.add(name.lower())
+    
     return name
 
 
@@ -164,15 +218,11 @@ def reconcile_files(finfinity_file, cashfree_file, augmont_file):
     Main reconciliation logic.
     Returns a BytesIO object containing the Excel workbook.
     """
-    # Read files
-    df_finfinity = read_file(finfinity_file)
-    df_cashfree = read_file(cashfree_file)
-    df_augmont = read_file(augmont_file)
-    
-    # Store raw data for output
-    raw_finfinity = df_finfinity.copy()
-    raw_cashfree = df_cashfree.copy()
-    raw_augmont = df_augmont.copy()
+    # Read files concurrently; the CSV/Excel parsers release the GIL for most of their work
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        df_finfinity, df_cashfree, df_augmont = executor.map(
+            read_file, (finfinity_file, cashfree_file, augmont_file)
+        )
     
     # Validate required columns
     validate_columns(df_finfinity, ['Order Id', 'Merchant Transaction ID', 'Order Status'], 'Finfinity')
@@ -190,83 +240,92 @@ def reconcile_files(finfinity_file, cashfree_file, augmont_file):
     aug_merchant_txn_col = get_column_case_insensitive(df_augmont, 'Merchant Transaction Id')
     aug_status_col = get_column_case_insensitive(df_augmont, 'Transaction Status')
     
-    # Create normalized keys for matching
-    df_finfinity['_fin_order_key'] = df_finfinity[fin_order_id_col].apply(clean_key)
-    df_finfinity['_fin_merchant_key'] = df_finfinity[fin_merchant_txn_col].apply(clean_key)
+    # Status columns hold a handful of distinct values; store them as categoricals
+    df_finfinity[fin_status_col] = df_finfinity[fin_status_col].astype('category')
+    df_cashfree[cf_status_col] = df_cashfree[cf_status_col].astype('category')
+    df_augmont[aug_status_col] = df_augmont[aug_status_col].astype('category')
     
-    df_cashfree['_cf_order_key'] = df_cashfree[cf_order_id_col].apply(clean_key)
+    # Create normalized keys for matching. They are kept out of the input frames,
+    # which are written unchanged to the RAW_* sheets.
+    df_fin_keys = pd.DataFrame({
+        '_fin_order_key': normalize_key(df_finfinity[fin_order_id_col]),
+        '_fin_merchant_key': normalize_key(df_finfinity[fin_merchant_txn_col])
+    })
+    cf_order_keys = normalize_key(df_cashfree[cf_order_id_col])
+    aug_merchant_keys = normalize_key(df_augmont[aug_merchant_txn_col])
+    
+    # Lookup frames indexed by key: one row per key (last occurrence wins), blank keys never match.
+    # The key is also kept as a column so a successful match is visible after the join.
+    df_cf_lookup = (
+        pd.DataFrame({'_cf_order_key': cf_order_keys, 'Cashfree_Status': df_cashfree[cf_status_col]})
+        .loc[cf_order_keys != '']
+        .drop_duplicates('_cf_order_key', keep='last')
+        .set_index('_cf_order_key', drop=False)
+    )
+    df_aug_lookup = (
+        pd.DataFrame({'_aug_merchant_key': aug_merchant_keys, 'Augmont_Status': df_augmont[aug_status_col]})
+        .loc[aug_merchant_keys != '']
+        .drop_duplicates('_aug_merchant_key', keep='last')
+        .set_index('_aug_merchant_key', drop=False)
+    )
+    
+    # Match every Finfinity record against Cashfree (order key) and Augmont (merchant key)
+    df_matches = (
+        df_fin_keys
+        .join(df_cf_lookup, on='_fin_order_key', how='left')
+        .join(df_aug_lookup, on='_fin_merchant_key', how='left')
+    )
+    in_cashfree = df_matches['_cf_order_key'].notna()
+    in_augmont = df_matches['_aug_merchant_key'].notna()
+    cf_status = fill_missing_status(df_matches['Cashfree_Status'], in_cashfree)
+    aug_status = fill_missing_status(df_matches['Augmont_Status'], in_augmont)
+    fin_status = df_finfinity[fin_status_col]
+    
+    # Classify based on decision table
+    decision_category, action_required, priority = classify_by_decision_table(
+        fin_status, cf_status, aug_status
+    )
+    
+    # Create status combination strings: spaces → '_', first 10 characters of each status
+    fin_clean = fin_status.astype(str).str.replace(' ', '_', regex=False).str[:10].where(fin_status.notna(), 'NA')
+    cf_clean = cf_status.astype(str).str.replace(' ', '_', regex=False).str[:10]
+    aug_clean = aug_status.astype(str).str.replace(' ', '_', regex=False).str[:10]
+    status_combination = 'FIN_' + fin_clean + '_CF_' + cf_clean + '_AUG_' + aug_clean
+    
+    # Append the new columns as typed arrays in one step: YES/NO flags are
+    # categoricals built from the match booleans, no per-row strings
+    yes_no = ['NO', 'YES']
+    df_results = df_finfinity.assign(**{
+        'In Cashfree?': pd.Categorical.from_codes(in_cashfree.to_numpy(dtype=np.int8), yes_no),
+        'In Augmont?': pd.Categorical.from_codes(in_augmont.to_numpy(dtype=np.int8), yes_no),
+        'Cashfree_Status': cf_status.array,
+        'Augmont_Status': aug_status.array,
+        'Decision_Category': decision_category,
+        'Action_Required': action_required,
+        'Priority': priority,
+        'Status_Combination': pd.Categorical(status_combination)
+    })
     
-    df_augmont['_aug_merchant_key'] = df_augmont[aug_merchant_txn_col].apply(clean_key)
+    # Create filtered DataFrames from the match masks shared with the summary counts
+    missing_in_cashfree = ~in_cashfree.to_numpy()
+    missing_in_augmont = ~in_augmont.to_numpy()
+    df_missing_cashfree = df_results.loc[missing_in_cashfree]
+    df_missing_augmont = df_results.loc[missing_in_augmont]
+    df_missing_both = df_results.loc[missing_in_cashfree & missing_in_augmont]
     
-    # Create lookup dictionaries for Cashfree and Augmont
-    cf_lookup = df_cashfree.set_index('_cf_order_key')[cf_status_col].to_dict()
-    aug_lookup = df_augmont.set_index('_aug_merchant_key')[aug_status_col].to_dict()
+    # Calculate match statistics from a single Cashfree × Augmont crosstab
+    match_counts = pd.crosstab(in_cashfree, in_augmont).reindex(
+        index=[False, True], columns=[False, True], fill_value=0
+    )
     
-    # Process each Finfinity record
-    results = []
+    matched_in_cashfree = int(match_counts.loc[True].sum())
+    not_matched_in_cashfree = int(match_counts.loc[False].sum())
     
-    for idx, row in df_finfinity.iterrows():
-        fin_order_key = row['_fin_order_key']
-        fin_merchant_key = row['_fin_merchant_key']
-        fin_status = row[fin_status_col]
-        
-        # Match with Cashfree
-        in_cashfree = fin_order_key in cf_lookup and fin_order_key != ''
-        cf_status = cf_lookup.get(fin_order_key, 'MISSING') if in_cashfree else 'MISSING'
-        
-        # Match with Augmont
-        in_augmont = fin_merchant_key in aug_lookup and fin_merchant_key != ''
-        aug_status = aug_lookup.get(fin_merchant_key, 'MISSING') if in_augmont else 'MISSING'
-        
-        # Classify based on decision table
-        decision_category, action_required, priority = classify_by_decision_table(
-            fin_status, cf_status, aug_status
-        )
-        
-        # Create status combination string
-        fin_status_clean = str(fin_status).replace(' ', '_')[:10] if pd.notna(fin_status) else 'NA'
-        cf_status_clean = str(cf_status).replace(' ', '_')[:10] if cf_status != 'MISSING' else 'MISSING'
-        aug_status_clean = str(aug_status).replace(' ', '_')[:10] if aug_status != 'MISSING' else 'MISSING'
-        
-        status_combination = f"FIN_{fin_status_clean}_CF_{cf_status_clean}_AUG_{aug_status_clean}"
-        
-        result = {
-            **row.to_dict(),
-            'In Cashfree?': 'YES' if in_cashfree else 'NO',
-            'In Augmont?': 'YES' if in_augmont else 'NO',
-            'Cashfree_Status': cf_status,
-            'Augmont_Status': aug_status,
-            'Decision_Category': decision_category,
-            'Action_Required': action_required,
-            'Priority': priority,
-            'Status_Combination': status_combination
-        }
-        results.append(result)
-    
-    # Create results DataFrame
-    df_results = pd.DataFrame(results)
-    
-    # Remove internal keys from output
-    internal_cols = ['_fin_order_key', '_fin_merchant_key']
-    df_results = df_results.drop(columns=[col for col in internal_cols if col in df_results.columns])
-    
-    # Create filtered DataFrames
-    df_missing_cashfree = df_results[df_results['In Cashfree?'] == 'NO'].copy()
-    df_missing_augmont = df_results[df_results['In Augmont?'] == 'NO'].copy()
-    df_missing_both = df_results[
-        (df_results['In Cashfree?'] == 'NO') & 
-        (df_results['In Augmont?'] == 'NO')
-    ].copy()
-    
-    # Calculate match statistics
-    matched_in_cashfree = len(df_results[df_results['In Cashfree?'] == 'YES'])
-    not_matched_in_cashfree = len(df_results[df_results['In Cashfree?'] == 'NO'])
-    
-    matched_in_augmont = len(df_results[df_results['In Augmont?'] == 'YES'])
-    not_matched_in_augmont = len(df_results[df_results['In Augmont?'] == 'NO'])
-    
-    matched_in_both = len(df_results[(df_results['In Cashfree?'] == 'YES') & (df_results['In Augmont?'] == 'YES')])
-    not_matched_in_both = len(df_results[(df_results['In Cashfree?'] == 'NO') | (df_results['In Augmont?'] == 'NO')])
+    matched_in_augmont = int(match_counts[True].sum())
+    not_matched_in_augmont = int(match_counts[False].sum())
+    
+    matched_in_both = int(match_counts.loc[True, True])
+    not_matched_in_both = len(df_results) - matched_in_both
     
     # Create summary statistics in the requested format
     summary_data = {
@@ -340,24 +399,27 @@ def reconcile_files(finfinity_file, cashfree_file, augmont_file):
     }
     
     # Create action summary with descriptions, sorted by count descending (funnel style)
-    action_summary = df_results.groupby(['Action_Required', 'Decision_Category', 'Priority']).size().reset_index(name='Count')
+    action_summary = df_results.groupby(['Action_Required', 'Decision_Category', 'Priority'], observed=True).size().reset_index(name='Count')
     action_summary = action_summary.sort_values('Count', ascending=False)  # Funnel: highest count first
     
     # Add description column
-    action_summary['Description'] = action_summary['Decision_Category'].map(category_descriptions)
-    action_summary['Description'] = action_summary['Description'].fillna('No description available')
+    # Decision_Category is categorical: look each category up once, then take by code
+    decision_categories = action_summary['Decision_Category'].cat
+    descriptions = pd.Series(category_descriptions).reindex(decision_categories.categories)
+    descriptions = descriptions.fillna('No description available').to_numpy()
+    action_summary['Description'] = descriptions[decision_categories.codes.to_numpy()]
     
     # Reorder columns for better readability
     action_summary = action_summary[['Count', 'Action_Required', 'Decision_Category', 'Priority', 'Description']]
     
     # Create status combinations summary
-    status_combinations = df_results.groupby('Status_Combination').size().reset_index(name='Count')
+    status_combinations = df_results.groupby('Status_Combination', observed=True).size().reset_index(name='Count')
     status_combinations = status_combinations.sort_values('Count', ascending=False)
     
     # Create Excel output
     output = BytesIO()
     
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
+    with pd.ExcelWriter(output, engine='xlsxwriter', engine_kwargs={'options': {'strings_to_urls': False}}) as writer:
         # Summary sheets
         df_summary.to_excel(writer, sheet_name='SUMMARY', index=False)
         action_summary.to_excel(writer, sheet_name='ACTION_SUMMARY', index=False)
@@ -389,21 +451,144 @@ def reconcile_files(finfinity_file, cashfree_file, augmont_file):
             )
         
         # Dynamic status-combination sheets
-        unique_combinations = df_results['Status_Combination'].unique()
-        for combo in unique_combinations:
-            df_combo = df_results[df_results['Status_Combination'] == combo].copy()
-            sheet_name = sanitize_sheet_name(combo)
+        used_sheet_names = {name.lower() for name in writer.sheets}
+        for combo, df_combo in df_results.groupby('Status_Combination', sort=False, observed=True):
+            sheet_name = sanitize_sheet_name(combo, used_sheet_names)
             df_combo.to_excel(writer, sheet_name=sheet_name, index=False)
         
         # Raw data sheets
-        raw_finfinity.to_excel(writer, sheet_name='RAW_FINFINITY', index=False)
-        raw_cashfree.to_excel(writer, sheet_name='RAW_CASHFREE', index=False)
-        raw_augmont.to_excel(writer, sheet_name='RAW_AUGMONT', index=False)
+        df_finfinity.to_excel(writer, sheet_name='RAW_FINFINITY', index=False)
+        df_cashfree.to_excel(writer, sheet_name='RAW_CASHFREE', index=False)
+        df_augmont.to_excel(writer, sheet_name='RAW_AUGMONT', index=False)
     
     output.seek(0)
     return output
 
 
+# ============================================================================
+# BACKGROUND JOBS
+# ============================================================================
+
+# Job results live on disk so every gunicorn worker on the host can serve a poll:
+# <job_id>.pending while queued (empty) or running, then <job_id>.xlsx on success or <job_id>.json on error
+JOBS_DIR = os.path.join(tempfile.gettempdir(), 'digigold_recon_jobs')
+JOB_ID_PATTERN = re.compile(r'[0-9a-f]{32}')
+
+# A job that has been running longer than this (measured from when it left the queue)
+# belongs to a worker that died (killed, redeployed)
+JOB_TIMEOUT_SECONDS = 30 * 60
+# Any job file older than this is removed by the sweep that runs on each submission
+JOB_TTL_SECONDS = 60 * 60
+
+job_executor = ThreadPoolExecutor(max_workers=4)
+
+
+class UploadError(ValueError):
+    """A missing or invalid upload: an ordinary user mistake, answered with a 400 but not logged as an error."""
+
+
+def get_uploaded_files():
+    """
+    Fetch the three uploaded files from the current request and validate them.
+    Returns (finfinity_file, cashfree_file, augmont_file); raises UploadError on invalid input.
+    """
+    # Check if all files are uploaded
+    if 'finfinity' not in request.files:
+        raise UploadError('Finfinity file is required')
+    if 'cashfree' not in request.files:
+        raise UploadError('Cashfree file is required')
+    if 'augmont' not in request.files:
+        raise UploadError('Augmont file is required')
+    
+    finfinity_file = request.files['finfinity']
+    cashfree_file = request.files['cashfree']
+    augmont_file = request.files['augmont']
+    
+    # Validate files are not empty
+    if finfinity_file.filename == '':
+        raise UploadError('Finfinity file is required')
+    if cashfree_file.filename == '':
+        raise UploadError('Cashfree file is required')
+    if augmont_file.filename == '':
+        raise UploadError('Augmont file is required')
+    
+    # Validate file extensions
+    allowed_extensions = ['.csv', '.xlsx', '.xls']
+    for file, name in [(finfinity_file, 'Finfinity'), 
+                       (cashfree_file, 'Cashfree'), 
+                       (augmont_file, 'Augmont')]:
+        ext = '.' + file.filename.rsplit('.', 1)[-1].lower() if '.' in file.filename else ''
+        if ext not in allowed_extensions:
+            raise UploadError(f'{name} file must be CSV or XLSX format. Got: {file.filename}')
+    
+    return finfinity_file, cashfree_file, augmont_file
+
+
+def job_path(job_id, extension):
+    """Path of a job's state file in JOBS_DIR."""
+    return os.path.join(JOBS_DIR, f'{job_id}{extension}')
+
+
+def claim_job_file(job_id, extension):
+    """
+    Atomically move a job's state file to a private path so only one poll can consume it.
+    Returns the claimed path, or None if the file does not exist (or another poll took it).
+    """
+    claimed_path = job_path(job_id, f'{extension}.{uuid.uuid4().hex}.claimed')
+    try:
+        os.replace(job_path(job_id, extension), claimed_path)
+    except FileNotFoundError:
+        return None
+    return claimed_path
+
+
+def sweep_expired_jobs():
+    """Remove job files (unpolled results, orphaned markers) older than JOB_TTL_SECONDS."""
+    cutoff = time.time() - JOB_TTL_SECONDS
+    with os.scandir(JOBS_DIR) as entries:
+        for entry in entries:
+            try:
+                if entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+            except FileNotFoundError:
+                pass  # Claimed or removed concurrently
+
+
+def write_job_error(job_id, message, status_code):
+    """Record a failed job's error message and HTTP status in JOBS_DIR."""
+    # Write under a temporary name so a poll never claims a half-written file
+    with open(job_path(job_id, '.json.tmp'), 'w') as f:
+        json.dump({'error': message, 'status_code': status_code}, f)
+    os.replace(job_path(job_id, '.json.tmp'), job_path(job_id, '.json'))
+
+
+def run_reconcile_job(job_id, finfinity_file, cashfree_file, augmont_file):
+    """
+    Run a reconciliation in the background and leave its outcome in JOBS_DIR.
+    The outcome file is written before the .pending marker is removed, so a poll always sees a state.
+    """
+    try:
+        # Mark the job as started; this also restarts the marker's mtime, so time spent
+        # queued behind other jobs does not count towards JOB_TIMEOUT_SECONDS
+        with open(job_path(job_id, '.pending'), 'w') as f:
+            f.write('running')
+        output = reconcile_files(finfinity_file, cashfree_file, augmont_file)
+        with open(job_path(job_id, '.xlsx.tmp'), 'wb') as f:
+            f.write(output.getbuffer())
+        os.replace(job_path(job_id, '.xlsx.tmp'), job_path(job_id, '.xlsx'))
+    except ValueError as e:
+        app.logger.error(f'ValueError: {str(e)}')
+        write_job_error(job_id, str(e), 400)
+    except Exception as e:
+        app.logger.error(f'Exception: {traceback.format_exc()}')
+        write_job_error(job_id, f'An error occurred: {str(e)}', 500)
+    finally:
+        try:
+            os.remove(job_path(job_id, '.pending'))
+        except FileNotFoundError:
+            pass  # Already reported as failed by a poll after JOB_TIMEOUT_SECONDS
+
+
 # ============================================================================
 # FLASK ROUTES
 # ============================================================================
@@ -418,36 +603,7 @@ def index():
 def reconcile():
     """Process uploaded files and return Excel reconciliation report."""
     try:
-        # Check if all files are uploaded
-        if 'finfinity' not in request.files:
-            return jsonify({'error': 'Finfinity file is required'}), 400
-        if 'cashfree' not in request.files:
-            return jsonify({'error': 'Cashfree file is required'}), 400
-        if 'augmont' not in request.files:
-            return jsonify({'error': 'Augmont file is required'}), 400
-        
-        finfinity_file = request.files['finfinity']
-        cashfree_file = request.files['cashfree']
-        augmont_file = request.files['augmont']
-        
-        # Validate files are not empty
-        if finfinity_file.filename == '':
-            return jsonify({'error': 'Finfinity file is required'}), 400
-        if cashfree_file.filename == '':
-            return jsonify({'error': 'Cashfree file is required'}), 400
-        if augmont_file.filename == '':
-            return jsonify({'error': 'Augmont file is required'}), 400
-        
-        # Validate file extensions
-        allowed_extensions = ['.csv', '.xlsx', '.xls']
-        for file, name in [(finfinity_file, 'Finfinity'), 
-                           (cashfree_file, 'Cashfree'), 
-                           (augmont_file, 'Augmont')]:
-            ext = '.' + file.filename.rsplit('.', 1)[-1].lower() if '.' in file.filename else ''
-            if ext not in allowed_extensions:
-                return jsonify({
-                    'error': f'{name} file must be CSV or XLSX format. Got: {file.filename}'
-                }), 400
+        finfinity_file, cashfree_file, augmont_file = get_uploaded_files()
         
         # Perform reconciliation
         output = reconcile_files(finfinity_file, cashfree_file, augmont_file)
@@ -460,15 +616,84 @@ def reconcile():
             download_name='reconciliation_output.xlsx'
         )
     
+    except UploadError as e:
+        return jsonify({'error': str(e)}), 400
     except ValueError as e:
         app.logger.error(f'ValueError: {str(e)}')
         return jsonify({'error': str(e)}), 400
     except Exception as e:
-        import traceback
         app.logger.error(f'Exception: {traceback.format_exc()}')
         return jsonify({'error': f'An error occurred: {str(e)}'}), 500
 
 
+@app.route('/reconcile/jobs', methods=['POST'])
+def submit_reconcile_job():
+    """Queue a reconciliation and return 202 with the URL to poll for the result."""
+    try:
+        uploads = get_uploaded_files()
+    except UploadError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    # The request's upload streams are closed once it returns; buffer them for the worker
+    buffered = [FileStorage(stream=BytesIO(file.read()), filename=file.filename) for file in uploads]
+    
+    job_id = uuid.uuid4().hex
+    os.makedirs(JOBS_DIR, exist_ok=True)
+    sweep_expired_jobs()
+    open(job_path(job_id, '.pending'), 'w').close()
+    job_executor.submit(run_reconcile_job, job_id, *buffered)
+    
+    status_url = url_for('get_reconcile_job', job_id=job_id)
+    return jsonify({'job_id': job_id, 'status': 'pending', 'status_url': status_url}), 202, {'Location': status_url}
+
+
+@app.route('/reconcile/jobs/<job_id>')
+def get_reconcile_job(job_id):
+    """Return 202 while the job runs, then the Excel report (or its error) exactly once."""
+    if not JOB_ID_PATTERN.fullmatch(job_id):
+        return jsonify({'error': 'Unknown job'}), 404
+    
+    # Note whether the job is running before looking for its outcome: the outcome file is
+    # written before the marker is removed, so a missing marker means the outcome already exists
+    try:
+        pending = os.stat(job_path(job_id, '.pending'))
+    except FileNotFoundError:
+        pending = None
+    
+    claimed_path = claim_job_file(job_id, '.xlsx')
+    if claimed_path is not None:
+        with open(claimed_path, 'rb') as f:
+            output = BytesIO(f.read())
+        os.remove(claimed_path)
+        return send_file(
+            output,
+            mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+            as_attachment=True,
+            download_name='reconciliation_output.xlsx'
+        )
+    
+    claimed_path = claim_job_file(job_id, '.json')
+    if claimed_path is not None:
+        with open(claimed_path) as f:
+            error = json.load(f)
+        os.remove(claimed_path)
+        return jsonify({'error': error['error']}), error['status_code']
+    
+    if pending is None:
+        return jsonify({'error': 'Unknown job'}), 404
+    
+    # The worker running this job died without recording an outcome
+    job_started = pending.st_size > 0
+    if job_started and time.time() - pending.st_mtime > JOB_TIMEOUT_SECONDS:
+        claimed_path = claim_job_file(job_id, '.pending')
+        if claimed_path is None:
+            return jsonify({'error': 'Unknown job'}), 404
+        os.remove(claimed_path)
+        return jsonify({'error': 'Reconciliation job did not finish. Please submit the files again.'}), 500
+    
+    return jsonify({'job_id': job_id, 'status': 'pending'}), 202
+
+
 @app.route('/health')
 def health():
     """Health check endpoint."""